@@ -3,25 +3,73 @@ from __future__ import print_function
 
 __author__ = "bibow"
 
+import hashlib
+import json
 import logging
 import os
-from typing import Any, Dict
+import re
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional, Pattern, Tuple
 
 import boto3
 
 # Global constants
-SYSTEM_CONSTANTS = [
-    "region_name",
-    "aws_access_key_id",
-    "aws_secret_access_key",
-    "title",
-    "version",
-    "configuration",
-    "functions",
-    "funct_bucket_name",
-    "funct_zip_path",
-    "funct_extract_path",
-]
+SYSTEM_CONSTANTS = frozenset(
+    [
+        "region_name",
+        "aws_access_key_id",
+        "aws_secret_access_key",
+        "title",
+        "version",
+        "configuration",
+        "functions",
+        "funct_bucket_name",
+        "funct_zip_path",
+        "funct_extract_path",
+        "prewarm",
+    ]
+)
+
+# A path segment that is exactly one placeholder, e.g. "{item_id}"
+PATH_PLACEHOLDER = re.compile(r"{(\w+)}")
+
+
+@dataclass(frozen=True, slots=True)
+class FunctionSpec:
+    """
+    Configuration of one action function, as listed in the "functions" setting.
+    Frozen only at the top level: the parameters, response and configuration
+    dicts stay mutable, and hash() raises TypeError because of them.
+    """
+
+    function_name: str
+    module_name: str
+    class_name: str
+    path: str
+    # Only used to generate the OpenAPI document
+    method: str = "GET"
+    parameters: Tuple[Dict[str, Any], ...] = ()
+    response: Dict[str, Any] = field(default_factory=dict)
+    summary: Optional[str] = None
+    configuration: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_setting(cls, function: Dict[str, Any]) -> "FunctionSpec":
+        """
+        Build a FunctionSpec from a function setting, ignoring unknown keys.
+        Args:
+            function (Dict[str, Any]): Function configuration dictionary.
+
+        Returns:
+            FunctionSpec: The function specification.
+        """
+        values = {k: function[k] for k in _FUNCTION_SPEC_FIELDS if k in function}
+        if "parameters" in values:
+            values["parameters"] = tuple(values["parameters"])
+        return cls(**values)
+
+
+_FUNCTION_SPEC_FIELDS = tuple(spec_field.name for spec_field in fields(FunctionSpec))
 
 
 class Config:
@@ -36,8 +84,20 @@ class Config:
     base_path = None
     configuration = None
     functions = None
+    functions_by_name = None
+    revision = None
+    configuration_revision = None
+    compiled_paths = None
     aws_s3 = None
 
+    # Segment trie of function paths, keyed by segment count, for path routing
+    route_trie: Dict[int, Dict[str, Any]] = {}
+    # Paths mixing literals and placeholders, matched by regex: parallel columns of
+    # (indexes, patterns, function names), bucketed by segment count
+    regex_routes: Dict[
+        int, Tuple[Tuple[int, ...], Tuple[Pattern, ...], Tuple[str, ...]]
+    ] = {}
+
     funct_bucket_name = None
     funct_zip_path = "/tmp/funct_zips"
     funct_extract_path = "/tmp/functs"
@@ -51,11 +111,25 @@ class Config:
             **setting (Dict[str, Any]): Configuration dictionary.
         """
         try:
+            previous_revision = cls.revision
+            previous_configuration_revision = cls.configuration_revision
             cls._set_parameters(setting)
+            # Routes and path items only depend on settings covered by revision
+            if cls.revision != previous_revision:
+                cls._compile_routes()
+                cls._compile_paths(logger)
+            # Cached action function instances hold the previous configuration
+            if cls.configuration_revision != previous_configuration_revision:
+                cls._clear_action_functions()
             cls._initialize_aws_services(setting)
             cls._setup_function_paths(setting)
+            if setting.get("prewarm", False):
+                cls._prewarm_modules(logger)
             logger.info("Configuration initialized successfully.")
         except Exception as e:
+            # Force a full rebuild next time instead of serving stale tables
+            cls.revision = None
+            cls.configuration_revision = None
             logger.exception("Failed to initialize configuration.")
             raise e
 
@@ -71,7 +145,89 @@ class Config:
         cls.servers = setting["servers"]
         cls.base_path = setting["base_path"]
         cls.configuration = setting["configuration"]
-        cls.functions = setting["functions"]
+        cls.functions = tuple(
+            FunctionSpec.from_setting(function) for function in setting["functions"]
+        )
+        cls.functions_by_name = {
+            function.function_name: function for function in cls.functions
+        }
+        # Digest of the settings the generated documents are built from
+        cls.revision = _digest(
+            [cls.title, cls.version, cls.servers, cls.base_path, setting["functions"]]
+        )
+        # Digest of the settings the action function instances are built from
+        cls.configuration_revision = _digest([cls.configuration, setting["functions"]])
+
+    @classmethod
+    def _compile_routes(cls) -> None:
+        """
+        Build the routing tables for the paths of the configured functions.
+        Each path is split on "/" into literal and {placeholder} segments and added
+        to a trie bucketed by segment count. A terminal node records the function
+        index (config order decides ties), its name and the placeholder positions.
+        Paths with segments mixing literals and placeholders fall back to a regex,
+        also bucketed by segment count since placeholders never match "/".
+        """
+        route_trie = {}
+        regex_buckets = {}
+        for index, function in enumerate(cls.functions):
+            segments = function.path.split("/")
+            if any(
+                "{" in segment and not PATH_PLACEHOLDER.fullmatch(segment)
+                for segment in segments
+            ):
+                regex_buckets.setdefault(len(segments), []).append(
+                    (index, _path_pattern(function.path), function.function_name)
+                )
+                continue
+
+            node = route_trie.setdefault(len(segments), _new_route_node())
+            parameters = []
+            for position, segment in enumerate(segments):
+                placeholder = PATH_PLACEHOLDER.fullmatch(segment)
+                if placeholder:
+                    parameters.append((position, placeholder.group(1)))
+                    if node["param"] is None:
+                        node["param"] = _new_route_node()
+                    node = node["param"]
+                else:
+                    node = node["literals"].setdefault(segment, _new_route_node())
+            node["routes"].append((index, function.function_name, tuple(parameters)))
+
+        cls.route_trie = route_trie
+        cls.regex_routes = {
+            segment_count: tuple(map(tuple, zip(*routes)))
+            for segment_count, routes in regex_buckets.items()
+        }
+
+    @classmethod
+    def _compile_paths(cls, logger: logging.Logger) -> None:
+        """
+        Precompile the Swagger path items of the configured functions.
+        A failure is only logged so that function dispatch still works; the
+        Swagger request then compiles the paths itself and reports the error.
+        Args:
+            logger (logging.Logger): Logger instance for logging.
+        """
+        # Imported here because swagger_generator depends on Config
+        from .swagger_generator import compile_paths
+
+        try:
+            cls.compiled_paths = compile_paths(cls.functions, cls.base_path)
+        except Exception:
+            logger.exception("Failed to compile Swagger paths.")
+            cls.compiled_paths = None
+
+    @classmethod
+    def _clear_action_functions(cls) -> None:
+        """
+        Drop the cached action functions so they are rebuilt with the new
+        configuration on next use.
+        """
+        # Imported here because function_handler depends on Config
+        from .function_handler import clear_action_function_cache
+
+        clear_action_function_cache()
 
     @classmethod
     def _initialize_aws_services(cls, setting: Dict[str, Any]) -> None:
@@ -109,3 +265,60 @@ class Config:
 
         os.makedirs(cls.funct_zip_path, exist_ok=True)
         os.makedirs(cls.funct_extract_path, exist_ok=True)
+
+    @classmethod
+    def _prewarm_modules(cls, logger: logging.Logger) -> None:
+        """
+        Download and extract the modules of all configured functions up front.
+        Args:
+            logger (logging.Logger): Logger instance for logging.
+        """
+        # Imported here because s3_client depends on Config
+        from .s3_client import prewarm_modules
+
+        prewarm_modules(
+            logger, sorted({function.module_name for function in cls.functions})
+        )
+
+
+def _digest(value: Any) -> str:
+    """
+    Digest a JSON-compatible setting value.
+    Args:
+        value (Any): The value to digest.
+
+    Returns:
+        str: SHA-1 hex digest of the value's canonical JSON.
+    """
+    return hashlib.sha1(
+        json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _path_pattern(path: str) -> Pattern:
+    """
+    Compile a path with {placeholder} segments into a regex.
+    Literal parts are escaped, and each placeholder becomes a named group
+    matching one segment.
+    Args:
+        path (str): The function path.
+
+    Returns:
+        Pattern: The compiled path regex.
+    """
+    # PATH_PLACEHOLDER.split alternates literal parts and placeholder names
+    parts = PATH_PLACEHOLDER.split(path)
+    parts[::2] = map(re.escape, parts[::2])
+    parts[1::2] = (f"(?P<{name}>[^/]+)" for name in parts[1::2])
+    return re.compile("".join(parts))
+
+
+def _new_route_node() -> Dict[str, Any]:
+    """
+    Create an empty node for the path routing trie.
+
+    Returns:
+        Dict[str, Any]: Node with literal children, a placeholder child and the
+        routes terminating at this node.
+    """
+    return {"literals": {}, "param": None, "routes": []}
@@ -4,18 +4,44 @@ from __future__ import print_function
 __author__ = "bibow"
 
 
+import copy
 import logging
 import os
-import re
 import sys
-import traceback
-from typing import Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Set, Tuple
 
 from silvaengine_utility import Utility  # Reuse existing utility functions
 
+# orjson is optional; results fall back to Utility.json_dumps without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .config import Config  # Import Config class
 from .s3_client import download_and_extract_module, module_exists
 
+# Types orjson encodes natively but Utility.json_dumps encodes its own way
+_ORJSON_PASSTHROUGH = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+# Bound action functions keyed by function name, populated on first load
+_action_function_cache: Dict[str, Callable] = {}
+
+# Module paths already appended to sys.path
+_registered_paths: Set[str] = set()
+
+
+def clear_action_function_cache() -> None:
+    """
+    Clear the cached action functions so they are reloaded on next use.
+    Call this after the function configuration has been changed.
+    """
+    _action_function_cache.clear()
+
 
 def load_action_function(
     logger: logging.Logger, function_name: str
@@ -29,53 +55,57 @@ def load_action_function(
     Returns:
         Optional[Callable]: Callable object of the function if successful, None otherwise.
     """
+    if function_name in _action_function_cache:
+        return _action_function_cache[function_name]
+
     try:
         # Find the function configuration
-        action_functions = list(
-            filter(lambda x: x["function_name"] == function_name, Config.functions)
-        )
-        if not action_functions:
+        action_function = Config.functions_by_name.get(function_name)
+        if action_function is None:
             logger.error(f"Function {function_name} not found in configuration.")
             return None
 
-        action_function = action_functions[0]
-        module_name = action_function["module_name"]
-
-        # Ensure the module exists locally
-        if not module_exists(logger, module_name):
-            logger.info(f"Downloading and extracting module {module_name}.")
-            if not download_and_extract_module(logger, module_name):
-                logger.error(f"Failed to load module {module_name}.")
-                return None
-
-        # Add the module path to sys.path
-        module_path = os.path.join(Config.funct_extract_path, module_name)
-        if module_path not in sys.path:
-            sys.path.append(module_path)
-
-        # Import the module and retrieve the class
-        logger.info(f"Loading module {module_name}.")
-        module = __import__(module_name)
-        class_name = action_function["class_name"]
+        module_name = action_function.module_name
+
+        # Modules already imported skip the filesystem and sys.path work
+        module = sys.modules.get(module_name)
+        if module is None:
+            # Ensure the module exists locally
+            if not module_exists(logger, module_name):
+                logger.info(f"Downloading and extracting module {module_name}.")
+                if not download_and_extract_module(logger, module_name):
+                    logger.error(f"Failed to load module {module_name}.")
+                    return None
+
+            # Add the module path to sys.path
+            module_path = os.path.join(Config.funct_extract_path, module_name)
+            if module_path not in _registered_paths:
+                if module_path not in sys.path:
+                    sys.path.append(module_path)
+                _registered_paths.add(module_path)
+
+            # Import the module
+            logger.info(f"Loading module {module_name}.")
+            module = __import__(module_name)
+
+        # Retrieve the class
+        class_name = action_function.class_name
         action_function_class = getattr(module, class_name)
 
+        # Function configuration overrides the shared one
+        configuration = {
+            **Config.configuration,
+            **(action_function.configuration or {}),
+        }
+
         # Instantiate the class and retrieve the function
-        instance = action_function_class(
-            logger,
-            **Utility.json_loads(
-                Utility.json_dumps(
-                    dict(
-                        Config.configuration, **action_function.get("configuration", {})
-                    )
-                )
-            ),
-        )
-        return getattr(instance, function_name)
+        # Deep copy so the instance cannot mutate the shared configuration
+        instance = action_function_class(logger, **copy.deepcopy(configuration))
+        _action_function_cache[function_name] = getattr(instance, function_name)
+        return _action_function_cache[function_name]
 
     except Exception as e:
-        logger.error(
-            f"Failed to load function {function_name}: {traceback.format_exc()}"
-        )
+        logger.exception("Failed to load function %s", function_name)
         return None
 
 
@@ -92,17 +122,41 @@ def get_function_name_and_path_parameters(
         Tuple[Optional[str], Optional[Dict[str, str]]]: The function name and path parameters, or (None, None) if not found.
     """
     try:
-        for function in Config.functions:
-            # Replace placeholders with regex patterns for path parameters
-            pattern = re.sub(r"{(\w+)}", r"(?P<\1>[^/]+)", function["path"])
-            match = re.fullmatch(pattern, path)
+        # Walk the segment trie built in Config.initialize; no regex involved
+        parts = path.split("/")
+        matched = None
+        root = Config.route_trie.get(len(parts))
+        stack = [(root, 0)] if root else []
+        while stack:
+            node, depth = stack.pop()
+            if depth == len(parts):
+                for route in node["routes"]:
+                    if matched is None or route[0] < matched[0]:
+                        matched = route
+                continue
+            part = parts[depth]
+            child = node["literals"].get(part)
+            if child:
+                stack.append((child, depth + 1))
+            if part and node["param"]:
+                stack.append((node["param"], depth + 1))
+
+        # Paths with mixed segments are matched by regex, honouring config order
+        for index, pattern, function_name in zip(
+            *Config.regex_routes.get(len(parts), ((), (), ()))
+        ):
+            if matched is not None and index > matched[0]:
+                break
+            match = pattern.fullmatch(path)
             if match:
-                return function["function_name"], match.groupdict()
-        return None, None
+                return function_name, match.groupdict()
+
+        if matched is None:
+            return None, None
+        _, function_name, parameters = matched
+        return function_name, {name: parts[position] for position, name in parameters}
     except Exception as e:
-        logger.error(
-            f"Error extracting function name and parameters: {traceback.format_exc()}"
-        )
+        logger.exception("Error extracting function name and parameters")
         raise e
 
 
@@ -127,11 +181,28 @@ def execute_function(
 
         logger.info(f"Executing function {function_name} with parameters: {kwargs}")
         result = action_function(**kwargs)
-        return (
-            Utility.json_dumps(result) if isinstance(result, (dict, list)) else result
-        )
+        return _dump_result(result) if isinstance(result, (dict, list)) else result
     except Exception as e:
-        logger.error(
-            f"Failed to execute function {function_name}: {traceback.format_exc()}"
-        )
+        logger.exception("Failed to execute function %s", function_name)
         raise e
+
+
+def _dump_result(result: Any) -> str:
+    """
+    Serialize a dict or list result to JSON.
+    Uses orjson when installed and falls back to Utility.json_dumps for
+    values orjson cannot encode (e.g. Decimal). Datetime and dataclass values
+    are passed through orjson so they also fall back, keeping their encoding
+    independent of whether orjson is installed.
+    Args:
+        result (Any): The function result.
+
+    Returns:
+        str: The JSON string.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(result, option=_ORJSON_PASSTHROUGH).decode()
+        except TypeError:
+            pass
+    return Utility.json_dumps(result)
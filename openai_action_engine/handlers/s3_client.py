@@ -3,15 +3,37 @@ from __future__ import print_function
 
 __author__ = "bibow"
 
+import io
 import logging
 import os
+import shutil
 import zipfile
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set, Union
 
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
 from .config import Config  # Import Config class
 
+# Modules already verified or extracted under Config.funct_extract_path
+_extracted_modules: Set[str] = set()
+
+# Chunk size used when copying ZIP members to disk
+_COPY_BUFFER_SIZE = 1 << 16
+
+# ZIPs at or above this size are downloaded in parts
+_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+
+# Multipart, multi-threaded transfers for larger module ZIPs
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=_MULTIPART_THRESHOLD, max_concurrency=8, use_threads=True
+)
+
+# Smaller ZIPs are extracted from memory instead of via a file; larger ones keep
+# the multipart download and stay out of memory
+_IN_MEMORY_ZIP_LIMIT = _MULTIPART_THRESHOLD
+
 
 def download_module(logger: logging.Logger, module_name: str) -> Optional[str]:
     """
@@ -34,10 +56,22 @@ def download_module(logger: logging.Logger, module_name: str) -> Optional[str]:
         # Ensure the ZIP path directory exists
         os.makedirs(Config.funct_zip_path, exist_ok=True)
 
+        # Skip the download when the local copy matches the S3 object's ETag
+        head = Config.aws_s3.head_object(Bucket=Config.funct_bucket_name, Key=key)
+        etag = head["ETag"]
+        etag_path = f"{zip_path}.etag"
+        if os.path.exists(zip_path) and _read_etag(etag_path) == etag:
+            logger.info(f"Module {key} is up to date at {zip_path}")
+            return zip_path
+
         logger.info(
             f"Downloading module from S3: bucket={Config.funct_bucket_name}, key={key}"
         )
-        Config.aws_s3.download_file(Config.funct_bucket_name, key, zip_path)
+        Config.aws_s3.download_file(
+            Config.funct_bucket_name, key, zip_path, Config=_TRANSFER_CONFIG
+        )
+        with open(etag_path, "w") as f:
+            f.write(etag)
         logger.info(f"Successfully downloaded {key} from S3 to {zip_path}")
         return zip_path
     except ClientError as e:
@@ -48,6 +82,50 @@ def download_module(logger: logging.Logger, module_name: str) -> Optional[str]:
         raise e
 
 
+def download_module_bytes(logger: logging.Logger, module_name: str) -> Optional[bytes]:
+    """
+    Read a module ZIP file from the configured S3 bucket into memory.
+    Args:
+        logger (logging.Logger): Logger instance for logging information.
+        module_name (str): Name of the module to download.
+
+    Returns:
+        Optional[bytes]: The ZIP content, or None if it exceeds the in-memory limit.
+    """
+    key = f"{module_name}.zip"
+    try:
+        logger.info(
+            f"Reading module from S3: bucket={Config.funct_bucket_name}, key={key}"
+        )
+        response = Config.aws_s3.get_object(Bucket=Config.funct_bucket_name, Key=key)
+        if response["ContentLength"] >= _IN_MEMORY_ZIP_LIMIT:
+            logger.info(f"Module {key} is too large to extract from memory.")
+            response["Body"].close()
+            return None
+        return response["Body"].read()
+    except ClientError as e:
+        logger.error(f"ClientError while downloading {module_name}: {e}")
+        raise e
+    except Exception as e:
+        logger.exception(f"Unexpected error while downloading {module_name}: {e}")
+        raise e
+
+
+def _read_etag(etag_path: str) -> Optional[str]:
+    """
+    Read the ETag stored next to a downloaded ZIP file.
+    Args:
+        etag_path (str): Path to the ETag sidecar file.
+
+    Returns:
+        Optional[str]: The stored ETag, or None if there is none.
+    """
+    if not os.path.exists(etag_path):
+        return None
+    with open(etag_path) as f:
+        return f.read()
+
+
 def extract_module(logger: logging.Logger, zip_path: str) -> Optional[str]:
     """
     Extract a module ZIP file to the configured extraction path.
@@ -58,33 +136,93 @@ def extract_module(logger: logging.Logger, zip_path: str) -> Optional[str]:
     Returns:
         Optional[str]: Path to the extracted module, or None if an error occurred.
     """
-    try:
-        if not os.path.exists(zip_path):
-            logger.error(f"ZIP file not found: {zip_path}")
-            raise Exception(f"ZIP file not found: {zip_path}")
+    if not os.path.exists(zip_path):
+        logger.error(f"ZIP file not found: {zip_path}")
+        raise Exception(f"ZIP file not found: {zip_path}")
+
+    return _extract_zip(logger, zip_path, zip_path)
+
+
+def extract_module_from_bytes(
+    logger: logging.Logger, module_name: str, data: bytes
+) -> Optional[str]:
+    """
+    Extract an in-memory module ZIP file to the configured extraction path.
+    Args:
+        logger (logging.Logger): Logger instance for logging information.
+        module_name (str): Name of the module being extracted.
+        data (bytes): The ZIP content.
+
+    Returns:
+        Optional[str]: Path to the extracted module, or None if an error occurred.
+    """
+    return _extract_zip(logger, io.BytesIO(data), f"{module_name}.zip")
 
+
+def _extract_zip(
+    logger: logging.Logger, zip_file: Union[str, io.BytesIO], source: str
+) -> Optional[str]:
+    """
+    Extract a ZIP file, given as a path or a file object, to the extraction path.
+    Args:
+        logger (logging.Logger): Logger instance for logging information.
+        zip_file (Union[str, io.BytesIO]): The ZIP file to extract.
+        source (str): Name of the ZIP file used in log messages.
+
+    Returns:
+        Optional[str]: Path to the extracted module, or None if an error occurred.
+    """
+    try:
         # Ensure the extraction directory exists
         os.makedirs(Config.funct_extract_path, exist_ok=True)
 
-        logger.info(f"Extracting ZIP file: {zip_path}")
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(Config.funct_extract_path)
+        with zipfile.ZipFile(zip_file, "r") as zip_ref:
+            logger.info(f"Extracting ZIP file: {source}")
+            _extract_members(zip_ref, zip_ref.infolist(), Config.funct_extract_path)
         logger.info(f"Successfully extracted module to {Config.funct_extract_path}")
         return Config.funct_extract_path
     except zipfile.BadZipFile as e:
-        logger.error(f"BadZipFile error while extracting {zip_path}: {e}")
+        logger.error(f"BadZipFile error while extracting {source}: {e}")
         raise e
     except Exception as e:
-        logger.exception(f"Unexpected error while extracting {zip_path}: {e}")
+        logger.exception(f"Unexpected error while extracting {source}: {e}")
         raise e
 
 
+def _extract_members(
+    zip_ref: zipfile.ZipFile, members: List[zipfile.ZipInfo], extract_path: str
+) -> None:
+    """
+    Extract ZIP members, skipping files that already exist on disk.
+    Args:
+        zip_ref (zipfile.ZipFile): The opened ZIP file.
+        members (List[zipfile.ZipInfo]): Members to extract.
+        extract_path (str): Destination directory.
+    """
+    root = os.path.realpath(extract_path)
+    for member in members:
+        target = os.path.realpath(os.path.join(root, member.filename))
+        if os.path.commonpath([root, target]) != root:
+            raise Exception(f"Unsafe path in ZIP file: {member.filename}")
+
+        if member.is_dir():
+            os.makedirs(target, exist_ok=True)
+            continue
+        if os.path.exists(target):
+            continue
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with zip_ref.open(member) as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst, length=_COPY_BUFFER_SIZE)
+
+
 def download_and_extract_module(
     logger: logging.Logger, module_name: str
 ) -> Optional[str]:
     """
     Download and extract a module from S3.
-    Combines downloading the module as a ZIP file and extracting it.
+    Combines downloading the module as a ZIP file and extracting it. ZIPs within
+    the in-memory limit are extracted without being written to disk.
     Args:
         logger (logging.Logger): Logger instance for logging information.
         module_name (str): Name of the module to download and extract.
@@ -94,24 +232,66 @@ def download_and_extract_module(
     """
     logger.info(f"Initiating download and extraction for module: {module_name}")
 
-    # Download the module
-    zip_path = download_module(logger, module_name)
-    if not zip_path:
-        logger.error(f"Failed to download module {module_name}")
+    if not Config.funct_bucket_name:
+        logger.error("S3 bucket name is not configured.")
         return None
 
-    # Extract the module
-    extracted_path = extract_module(logger, zip_path)
+    # A ZIP already on disk goes through the ETag check in download_module;
+    # otherwise small ZIPs are extracted straight from memory
+    data = None
+    zip_path = os.path.join(Config.funct_zip_path, f"{module_name}.zip")
+    if not os.path.exists(zip_path):
+        data = download_module_bytes(logger, module_name)
+
+    if data is not None:
+        extracted_path = extract_module_from_bytes(logger, module_name, data)
+    else:
+        # Download the module
+        zip_path = download_module(logger, module_name)
+        if not zip_path:
+            logger.error(f"Failed to download module {module_name}")
+            return None
+
+        # Extract the module
+        extracted_path = extract_module(logger, zip_path)
+
     if not extracted_path:
         logger.error(f"Failed to extract module {module_name}")
         return None
 
+    _extracted_modules.add(module_name)
     logger.info(
         f"Module {module_name} downloaded and extracted successfully to {extracted_path}"
     )
     return extracted_path
 
 
+def prewarm_modules(logger: logging.Logger, module_names: List[str]) -> None:
+    """
+    Download and extract the given modules concurrently.
+    Modules already present locally are skipped and failures are only logged,
+    since load_action_function retries missing modules on demand.
+    Args:
+        logger (logging.Logger): Logger instance for logging information.
+        module_names (List[str]): Names of the modules to prepare.
+    """
+    pending = [name for name in module_names if not module_exists(logger, name)]
+    if not pending:
+        return
+
+    logger.info(f"Prewarming modules: {pending}")
+    with ThreadPoolExecutor(max_workers=min(16, len(pending))) as executor:
+        futures = {
+            name: executor.submit(download_and_extract_module, logger, name)
+            for name in pending
+        }
+    for name, future in futures.items():
+        try:
+            future.result()
+        except Exception as e:
+            logger.error(f"Failed to prewarm module {name}: {e}")
+
+
 def module_exists(logger: logging.Logger, module_name: str) -> bool:
     """
     Check if the specified module exists in the extracted path.
@@ -122,9 +302,13 @@ def module_exists(logger: logging.Logger, module_name: str) -> bool:
     Returns:
         bool: True if the module exists, False otherwise.
     """
+    if module_name in _extracted_modules:
+        return True
+
     module_dir = os.path.join(Config.funct_extract_path, module_name)
-    if os.path.exists(module_dir) and os.path.isdir(module_dir):
+    if os.path.isdir(module_dir):
         logger.info(f"Module {module_name} found in {Config.funct_extract_path}.")
+        _extracted_modules.add(module_name)
         return True
     logger.info(f"Module {module_name} not found in {Config.funct_extract_path}.")
     return False
@@ -3,12 +3,26 @@ from __future__ import print_function
 
 __author__ = "bibow"
 
+import hashlib
+import json
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
-import yaml
+from .config import Config, FunctionSpec  # Import Config and FunctionSpec
 
-from .config import Config  # Import Config class
+# orjson is optional; the JSON document falls back to json.dumps without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# PyYAML and the dumper class, loaded on first use to keep them off cold starts
+_yaml_dumper: Optional[Tuple[Any, type]] = None
+
+# Generated Swagger YAML keyed by Config.revision; only the current one is kept
+_swagger_yaml_cache: Dict[str, str] = {}
+# Generated Swagger JSON, keyed the same way
+_swagger_json_cache: Dict[str, str] = {}
 
 # Mapping from data types to OpenAPI schema types
 TYPE_MAPPING = {
@@ -23,173 +37,414 @@ TYPE_MAPPING = {
 }
 
 
+class _SchemaTypes(dict):
+    """
+    TYPE_MAPPING lookup defaulting unknown data types to "string" on subscript,
+    without inserting them.
+    """
+
+    def __missing__(self, key: Any) -> str:
+        return "string"
+
+
+_SCHEMA_TYPES = _SchemaTypes(TYPE_MAPPING)
+
+# HTTP methods whose "body" parameters go into the request body
+_BODY_METHODS = frozenset(["post", "put", "patch"])
+
+
+def clear_swagger_yaml_cache() -> None:
+    """
+    Clear the cached Swagger documents so they are regenerated on next request.
+    Call this after the function configuration has been changed.
+    """
+    _swagger_yaml_cache.clear()
+    _swagger_json_cache.clear()
+
+
 def generate_swagger_yaml(logger: logging.Logger) -> str:
     """
     Generates the Swagger YAML for the application.
+    The document is dumped once per Config.revision and its final text is
+    served from cache afterwards; it is not emitted by hand so that values are
+    always escaped. generate_swagger_yaml.cache_clear() drops the cache.
     Args:
         logger (logging.Logger): Logger instance for logging.
 
     Returns:
         str: The generated Swagger YAML as a string.
     """
-    try:
-        logger.info("Generating Swagger YAML...")
+    swagger_yaml = _swagger_yaml_cache.get(Config.revision)
+    if swagger_yaml is None:
+        swagger_yaml = _build_swagger_yaml(logger)
+        _swagger_yaml_cache.clear()
+        _swagger_yaml_cache[Config.revision] = swagger_yaml
+    return swagger_yaml
 
-        # Base Swagger configuration
-        swagger = {
-            "openapi": "3.1.0",
-            "info": {
-                "title": Config.title,
-                "version": Config.version,
-            },
-            "servers": [{"url": server} for server in Config.servers],
-            "paths": {},
-        }
 
-        # Generate paths and methods from functions
-        for function in Config.functions:
-            path = Config.base_path + function["path"]
-            method = function["method"].lower()
-            summary = function.get("summary", "No summary provided")
-            function_name = function.get("function_name", "unknownFunction")
-
-            # Request parameters and body
-            parameters = []
-            request_body = None
-            response = {}
-
-            for param in function["parameters"]:
-                if method in ["post", "put", "patch"] and param["in"] == "body":
-                    if request_body is None:
-                        request_body = {
-                            "required": True,
-                            "content": {
-                                "application/json": {
-                                    "schema": {"type": "object", "properties": {}}
+generate_swagger_yaml.cache_clear = clear_swagger_yaml_cache
+
+
+def generate_swagger_json(logger: logging.Logger) -> str:
+    """
+    Generates the Swagger document for the application as JSON.
+    Built from the same document as the YAML and cached per Config.revision.
+    Args:
+        logger (logging.Logger): Logger instance for logging.
+
+    Returns:
+        str: The generated Swagger JSON as a string.
+    """
+    swagger_json = _swagger_json_cache.get(Config.revision)
+    if swagger_json is None:
+        swagger_json = _build_swagger_json(logger)
+        _swagger_json_cache.clear()
+        _swagger_json_cache[Config.revision] = swagger_json
+    return swagger_json
+
+
+def compile_paths(
+    functions: Tuple[FunctionSpec, ...], base_path: str
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Builds the OpenAPI path items, keyed by path and method, for the functions.
+    Args:
+        functions (Tuple[FunctionSpec, ...]): The configured functions.
+        base_path (str): Prefix applied to every function path.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The "paths" section of the Swagger document.
+    """
+    schema_types = _SCHEMA_TYPES
+    # Schemas built for each properties list, keyed by content at the top level
+    # and by identity below it (see _handle_properties)
+    props_cache = {}
+    paths = {}
+
+    for function in functions:
+        path = base_path + function.path
+        method = function.method.lower()
+        summary = (
+            function.summary if function.summary is not None else "No summary provided"
+        )
+        function_name = function.function_name
+        accepts_body = method in _BODY_METHODS
+
+        # Request parameters and body
+        parameters = []
+        request_body = None
+        body_properties = None
+        response = {}
+
+        for param in function.parameters:
+            param_name = param["name"]
+            param_type = schema_types[param["type"]]
+            if accepts_body and param["in"] == "body":
+                if request_body is None:
+                    body_properties = {}
+                    request_body = {
+                        "required": True,
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": body_properties,
                                 }
-                            },
-                        }
-                    if "properties" in param:
-                        request_body["content"]["application/json"]["schema"][
-                            "properties"
-                        ][param["name"]] = {
-                            "type": TYPE_MAPPING.get(param["type"], "string"),
-                            "properties": _handle_properties(param.get("properties")),
-                        }
-                    else:
-                        request_body["content"]["application/json"]["schema"][
-                            "properties"
-                        ][param["name"]] = {
-                            "type": TYPE_MAPPING.get(param["type"], "string")
-                        }
-                else:
-                    parameters.append(
-                        {
-                            "name": param["name"],
-                            "in": param["in"],
-                            "required": param["required"],
-                            "schema": {
-                                "type": TYPE_MAPPING.get(param["type"], "string")
-                            },
-                        }
-                    )
-
-            # Response schema
-            response_config = function["response"]
-            if response_config["type"] == "list":
-                response = {
-                    "description": "Success",
-                    "content": {
-                        "application/json": {
-                            "schema": {
-                                "type": "array",
-                                "items": _build_response_schema(response_config),
                             }
-                        }
-                    },
+                        },
+                    }
+                if "properties" in param:
+                    body_properties[param_name] = {
+                        "type": param_type,
+                        "properties": _handle_properties(
+                            param.get("properties"), props_cache
+                        ),
+                    }
+                else:
+                    body_properties[param_name] = {"type": param_type}
+            else:
+                parameters.append(
+                    {
+                        "name": param_name,
+                        "in": param["in"],
+                        "required": param["required"],
+                        "schema": {"type": param_type},
+                    }
+                )
+
+        # Response schema
+        response_config = function.response
+        if response_config["type"] == "list":
+            response = _success_response(
+                {
+                    "type": "array",
+                    "items": _build_response_schema(response_config, props_cache),
                 }
-            elif response_config["type"] == "dict":
-                response = {
-                    "description": "Success",
-                    "content": {
-                        "application/json": {
-                            "schema": {
-                                "type": "object",
-                                "properties": _handle_properties(
-                                    response_config["properties"]
-                                ),
-                            }
-                        }
-                    },
+            )
+        elif response_config["type"] == "dict":
+            response = _success_response(
+                {
+                    "type": "object",
+                    "properties": _handle_properties(
+                        response_config["properties"], props_cache
+                    ),
                 }
+            )
+
+        # Add the operation to the path
+        if path not in paths:
+            paths[path] = {}
+        paths[path][method] = {
+            "summary": summary,
+            "operationId": function_name,
+            "parameters": parameters,
+            "responses": {"200": response},
+            **({"requestBody": request_body} if request_body else {}),
+        }
+
+    return paths
+
+
+def _get_yaml() -> Tuple[Any, type]:
+    """
+    Import PyYAML and build the dumper class on first use.
+
+    Returns:
+        Tuple[Any, type]: The yaml module and a dumper writing shared sub-schemas
+        in full instead of as YAML aliases.
+    """
+    global _yaml_dumper
+    if _yaml_dumper is None:
+        import yaml
+
+        # Prefer the libyaml-backed dumper when PyYAML was built with it
+        base_dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+        class _NoAliasDumper(base_dumper):
+            def ignore_aliases(self, data: Any) -> bool:
+                return True
+
+        _yaml_dumper = (yaml, _NoAliasDumper)
+    return _yaml_dumper
+
+
+def _build_swagger() -> Dict[str, Any]:
+    """
+    Builds the Swagger document from Config.
 
-            # Add the operation to the path
-            if path not in swagger["paths"]:
-                swagger["paths"][path] = {}
-            swagger["paths"][path][method] = {
-                "summary": summary,
-                "operationId": function_name,
-                "parameters": parameters,
-                "responses": {"200": response},
-                **({"requestBody": request_body} if request_body else {}),
-            }
+    Returns:
+        Dict[str, Any]: The Swagger document.
+    """
+    # Path items are compiled once per revision in Config.initialize
+    paths = Config.compiled_paths
+    if paths is None:
+        paths = compile_paths(Config.functions, Config.base_path)
+
+    # Base Swagger configuration
+    return {
+        "openapi": "3.1.0",
+        "info": {
+            "title": Config.title,
+            "version": Config.version,
+        },
+        "servers": [{"url": server} for server in Config.servers],
+        "paths": paths,
+    }
+
+
+def _build_swagger_yaml(logger: logging.Logger) -> str:
+    """
+    Builds the Swagger document from Config and dumps it to YAML.
+    Args:
+        logger (logging.Logger): Logger instance for logging.
+
+    Returns:
+        str: The generated Swagger YAML as a string.
+    """
+    try:
+        logger.info("Generating Swagger YAML...")
+        swagger = _build_swagger()
 
         # Convert to YAML
+        # Keep insertion order: document reads openapi, info, servers, paths
+        yaml, dumper = _get_yaml()
+        swagger_yaml = yaml.dump(
+            swagger,
+            Dumper=dumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+        )
         logger.info("Swagger YAML generated successfully.")
-        return yaml.dump(swagger, default_flow_style=False, allow_unicode=True)
+        return swagger_yaml
 
     except Exception as e:
         logger.exception("Failed to generate Swagger YAML.")
         raise e
 
 
-def _handle_properties(properties: Any) -> Dict[str, Any]:
+def _build_swagger_json(logger: logging.Logger) -> str:
+    """
+    Builds the Swagger document from Config and dumps it to JSON.
+    Args:
+        logger (logging.Logger): Logger instance for logging.
+
+    Returns:
+        str: The generated Swagger JSON as a string.
+    """
+    try:
+        logger.info("Generating Swagger JSON...")
+        swagger = _build_swagger()
+
+        if orjson is not None:
+            swagger_json = orjson.dumps(swagger).decode()
+        else:
+            # Compact separators match orjson's output byte for byte
+            swagger_json = json.dumps(
+                swagger, ensure_ascii=False, separators=(",", ":")
+            )
+        logger.info("Swagger JSON generated successfully.")
+        return swagger_json
+
+    except Exception as e:
+        logger.exception("Failed to generate Swagger JSON.")
+        raise e
+
+
+def _handle_properties(
+    properties: Any, cache: Optional[Dict[Hashable, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
     """
-    Recursively handle nested properties for schemas.
+    Handle nested properties for schemas.
+    Walks nested levels with an explicit stack instead of recursion, so deep
+    schemas do not hit the recursion limit. A properties list equal in content
+    to one seen before in the same cache reuses its already built schema.
+    Nested lists are keyed by identity, so each list is digested only once.
     Args:
         properties (Any): List or dictionary of properties.
+        cache (Optional[Dict[Hashable, Dict[str, Any]]]): Built schemas keyed by
+            _properties_key of top-level lists and id() of nested ones.
 
     Returns:
         Dict[str, Any]: OpenAPI-compatible schema properties.
     """
-    result = {}
-    for prop in properties:
-        prop_type = TYPE_MAPPING.get(prop["type"], "string")
-        if prop_type == "array" and "child_type" in prop:
-            child_type = TYPE_MAPPING.get(prop["child_type"], "string")
-            nested_properties = (
-                _handle_properties(prop["properties"]) if "properties" in prop else {}
-            )
-            result[prop["name"]] = {
-                "type": "array",
-                "items": {
-                    "type": child_type,
-                    "properties": nested_properties if child_type == "object" else None,
-                },
-            }
-        elif prop_type == "object" and "properties" in prop:
-            result[prop["name"]] = {
-                "type": "object",
-                "properties": _handle_properties(prop["properties"]),
-            }
-        else:
-            result[prop["name"]] = {"type": prop_type}
+    if cache is None:
+        cache = {}
+    key = _properties_key(properties)
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    schema_types = _SCHEMA_TYPES
+    result = cache[key] = {}
+    # (properties to handle, dict receiving their schemas)
+    stack = [(properties, result)]
+    while stack:
+        props, target = stack.pop()
+        for prop in props:
+            prop_type = schema_types[prop["type"]]
+            if prop_type == "array" and "child_type" in prop:
+                child_type = schema_types[prop["child_type"]]
+                nested_properties = {}
+                if "properties" in prop and child_type == "object":
+                    nested_properties = _cached_target(cache, prop["properties"], stack)
+                target[prop["name"]] = {
+                    "type": "array",
+                    "items": {
+                        "type": child_type,
+                        "properties": (
+                            nested_properties if child_type == "object" else None
+                        ),
+                    },
+                }
+            elif prop_type == "object" and "properties" in prop:
+                target[prop["name"]] = {
+                    "type": "object",
+                    "properties": _cached_target(cache, prop["properties"], stack),
+                }
+            else:
+                target[prop["name"]] = {"type": prop_type}
     return result
 
 
-def _build_response_schema(response_config: Dict[str, Any]) -> Dict[str, Any]:
+def _cached_target(
+    cache: Dict[Hashable, Dict[str, Any]],
+    properties: Any,
+    stack: List[Tuple[Any, Dict]],
+) -> Dict[str, Any]:
+    """
+    Return the schema dict for a nested properties list.
+    Unseen lists get a new dict, which is queued on the stack to be filled.
+    Lists are keyed by id(); digesting their content at every level would
+    cost more than building the schema.
+    Args:
+        cache (Dict[Hashable, Dict[str, Any]]): Built schemas keyed by id() of
+            the list.
+        properties (Any): The nested properties list.
+        stack (List[Tuple[Any, Dict]]): Work stack of _handle_properties.
+
+    Returns:
+        Dict[str, Any]: The schema dict for the properties list.
+    """
+    key = id(properties)
+    target = cache.get(key)
+    if target is None:
+        target = cache[key] = {}
+        stack.append((properties, target))
+    return target
+
+
+def _properties_key(properties: Any) -> Hashable:
+    """
+    Key identifying a properties list by content, so equal sub-schemas declared
+    separately share one build.
+    Args:
+        properties (Any): List or dictionary of properties.
+
+    Returns:
+        Hashable: A digest of the list's canonical JSON, or its id() when the
+        list is nested too deeply to serialize.
+    """
+    try:
+        canonical = json.dumps(properties, sort_keys=True, default=str)
+    except RecursionError:
+        return id(properties)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).digest()
+
+
+def _success_response(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Wraps a JSON schema in the "200" response object shared by all operations.
+    Args:
+        schema (Dict[str, Any]): The response body schema.
+
+    Returns:
+        Dict[str, Any]: OpenAPI-compatible response object.
+    """
+    return {
+        "description": "Success",
+        "content": {"application/json": {"schema": schema}},
+    }
+
+
+def _build_response_schema(
+    response_config: Dict[str, Any],
+    cache: Optional[Dict[Hashable, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
     """
     Builds the response schema based on the configuration.
     Args:
         response_config (Dict[str, Any]): The response configuration.
+        cache (Optional[Dict[Hashable, Dict[str, Any]]]): Cache passed to
+            _handle_properties.
 
     Returns:
         Dict[str, Any]: OpenAPI-compatible schema.
     """
-    child_type = TYPE_MAPPING.get(response_config.get("child_type"), "string")
+    child_type = _SCHEMA_TYPES[response_config.get("child_type")]
     if child_type == "object" and "properties" in response_config:
         return {
             "type": "object",
-            "properties": _handle_properties(response_config["properties"]),
+            "properties": _handle_properties(response_config["properties"], cache),
         }
     return {"type": child_type}
@@ -5,16 +5,15 @@ from __future__ import print_function
 __author__ = "bibow"
 
 import logging
+from collections import ChainMap
 from typing import Any, Dict, List, Tuple
 
-from silvaengine_utility import Utility
-
 from .handlers.config import SYSTEM_CONSTANTS, Config
 from .handlers.function_handler import (
     execute_function,
     get_function_name_and_path_parameters,
 )
-from .handlers.swagger_generator import generate_swagger_yaml
+from .handlers.swagger_generator import generate_swagger_json, generate_swagger_yaml
 
 
 # Hook function applied to deployment
@@ -52,24 +51,28 @@ class OpenaiActionEngine(object):
 
         self.logger = logger
         self.setting = setting
+        # Settings forwarded to every action function, filtered once
+        self._filtered_setting = {
+            k: v for k, v in setting.items() if k not in SYSTEM_CONSTANTS
+        }
 
     def openai_action_dispatch(self, **kwargs: Dict[str, Any]) -> Any:
-        path = "/" + kwargs.pop("path")
+        path = kwargs.pop("path", None)
         if path is None:
             raise Exception("path is required!!")
+        path = f"/{path}"
         self.logger.info(f"path = {path}")
 
-        kwargs = dict(
-            {k: v for k, v in self.setting.items() if k not in SYSTEM_CONSTANTS},
-            **kwargs,
-        )
-
-        if path.find("openapi.yaml") != -1:
+        if path.endswith(("/openapi.yaml", "/openapi.yml")):
             return generate_swagger_yaml(self.logger)
+        elif path.endswith("/openapi.json"):
+            return generate_swagger_json(self.logger)
         else:
             function_name, path_parameters = get_function_name_and_path_parameters(
                 self.logger, path
             )
-            kwargs = dict(kwargs, **path_parameters)
+            # Path parameters override request kwargs, which override settings;
+            # the layers are only materialized once, when unpacked for the call
+            parameters = ChainMap(path_parameters or {}, kwargs, self._filtered_setting)
 
-            return execute_function(self.logger, function_name, **kwargs)
+            return execute_function(self.logger, function_name, **parameters)
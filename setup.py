@@ -15,6 +15,7 @@ setup(
     include_package_data=True,
     zip_safe=False,
     platforms="Linux",
+    python_requires=">=3.10",
     install_requires=[],
     classifiers=[
         "Programming Language :: Python",
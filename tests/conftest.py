@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+__author__ = "bibow"
+
+import hashlib
+import io
+import os
+
+import pytest
+
+from openai_action_engine.handlers import (
+    function_handler,
+    s3_client,
+    swagger_generator,
+)
+from openai_action_engine.handlers.config import Config
+
+
+@pytest.fixture(autouse=True)
+def config_state(monkeypatch):
+    """
+    Restore Config and the module-level caches after each test.
+    """
+    for name, value in list(vars(Config).items()):
+        if not name.startswith("__") and not isinstance(value, classmethod):
+            monkeypatch.setattr(Config, name, value)
+    monkeypatch.setattr(function_handler, "_action_function_cache", {})
+    monkeypatch.setattr(s3_client, "_extracted_modules", set())
+    monkeypatch.setattr(swagger_generator, "_swagger_yaml_cache", {})
+    monkeypatch.setattr(swagger_generator, "_swagger_json_cache", {})
+
+
+@pytest.fixture
+def setting(tmp_path):
+    """
+    A minimal engine setting with one function and a temporary extract path.
+    """
+    return {
+        "title": "Actions",
+        "version": "1.0.0",
+        "servers": ["https://example.com"],
+        "base_path": "/api",
+        "configuration": {"tenant": "A"},
+        "functions": [
+            {
+                "function_name": "get_tenant",
+                "module_name": "tenant_module",
+                "class_name": "TenantAction",
+                "path": "/tenant",
+                "method": "GET",
+                "parameters": [],
+                "response": {
+                    "type": "dict",
+                    "properties": [{"name": "tenant", "type": "string"}],
+                },
+            }
+        ],
+        "funct_zip_path": str(tmp_path / "funct_zips"),
+        "funct_extract_path": str(tmp_path / "functs"),
+    }
+
+
+class FakeS3:
+    """
+    In-memory stand-in for the boto3 S3 client calls made by s3_client.
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.calls = []
+
+    def put(self, key, data):
+        self.objects[key] = data
+
+    def _etag(self, key):
+        return f'"{hashlib.md5(self.objects[key]).hexdigest()}"'
+
+    def head_object(self, Bucket, Key):
+        self.calls.append(("head_object", Key))
+        return {"ETag": self._etag(Key), "ContentLength": len(self.objects[Key])}
+
+    def get_object(self, Bucket, Key):
+        self.calls.append(("get_object", Key))
+        data = self.objects[Key]
+        return {"ContentLength": len(data), "Body": io.BytesIO(data)}
+
+    def download_file(self, Bucket, Key, Filename, Config=None):
+        self.calls.append(("download_file", Key))
+        with open(Filename, "wb") as f:
+            f.write(self.objects[Key])
+
+
+@pytest.fixture
+def fake_s3(tmp_path, monkeypatch):
+    """
+    Point Config at a FakeS3 client and temporary ZIP and extract paths.
+    """
+    s3 = FakeS3()
+    monkeypatch.setattr(Config, "aws_s3", s3)
+    monkeypatch.setattr(Config, "funct_bucket_name", "functs")
+    monkeypatch.setattr(Config, "funct_zip_path", str(tmp_path / "funct_zips"))
+    monkeypatch.setattr(Config, "funct_extract_path", str(tmp_path / "functs"))
+    os.makedirs(Config.funct_zip_path)
+    return s3
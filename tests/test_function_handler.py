@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+__author__ = "bibow"
+
+import datetime
+import logging
+import sys
+import types
+
+import pytest
+from silvaengine_utility import Utility
+
+from openai_action_engine.handlers.config import Config
+from openai_action_engine.handlers.function_handler import (
+    _dump_result,
+    load_action_function,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def test_dump_result_plain_structure():
+    result = {"a": [1, 2.5, "x", None, True]}
+
+    assert Utility.json_loads(_dump_result(result)) == result
+
+
+def test_dump_result_datetime_uses_utility_encoding():
+    result = {
+        "date": datetime.date(2024, 1, 2),
+        "at": datetime.datetime(2024, 1, 2, 3, 4, 5),
+    }
+
+    assert _dump_result(result) == Utility.json_dumps(result)
+
+
+class _TenantAction:
+    def __init__(self, logger, **setting):
+        self.setting = setting
+
+    def get_tenant(self, **kwargs):
+        return {"tenant": self.setting["tenant"]}
+
+
+@pytest.fixture
+def tenant_module(monkeypatch):
+    module = types.ModuleType("tenant_module")
+    module.TenantAction = _TenantAction
+    monkeypatch.setitem(sys.modules, "tenant_module", module)
+    return module
+
+
+def test_action_function_cached_for_same_configuration(setting, tenant_module):
+    Config.initialize(logger, **setting)
+    action_function = load_action_function(logger, "get_tenant")
+
+    Config.initialize(logger, **setting)
+
+    assert load_action_function(logger, "get_tenant") is action_function
+
+
+def test_action_function_rebuilt_on_configuration_change(setting, tenant_module):
+    Config.initialize(logger, **setting)
+    assert load_action_function(logger, "get_tenant")() == {"tenant": "A"}
+
+    Config.initialize(logger, **dict(setting, configuration={"tenant": "B"}))
+
+    assert load_action_function(logger, "get_tenant")() == {"tenant": "B"}
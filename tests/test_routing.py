@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+__author__ = "bibow"
+
+import logging
+
+import pytest
+
+from openai_action_engine.handlers.config import Config
+from openai_action_engine.handlers.function_handler import (
+    get_function_name_and_path_parameters,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def routes(setting):
+    """
+    Initialize Config with one function per (function_name, path) pair.
+    """
+
+    def initialize(*paths):
+        functions = [
+            {
+                "function_name": function_name,
+                "module_name": "module",
+                "class_name": "Class",
+                "path": path,
+                "response": {"type": "dict", "properties": []},
+            }
+            for function_name, path in paths
+        ]
+        Config.initialize(logger, **dict(setting, functions=functions))
+
+    return initialize
+
+
+def test_placeholder_listed_first_wins(routes):
+    routes(("get_item", "/items/{id}"), ("get_special", "/items/special"))
+
+    assert get_function_name_and_path_parameters(logger, "/items/special") == (
+        "get_item",
+        {"id": "special"},
+    )
+    assert get_function_name_and_path_parameters(logger, "/items/1") == (
+        "get_item",
+        {"id": "1"},
+    )
+
+
+def test_literal_listed_first_wins(routes):
+    routes(("get_special", "/items/special"), ("get_item", "/items/{id}"))
+
+    assert get_function_name_and_path_parameters(logger, "/items/special") == (
+        "get_special",
+        {},
+    )
+    assert get_function_name_and_path_parameters(logger, "/items/1") == (
+        "get_item",
+        {"id": "1"},
+    )
+
+
+def test_placeholder_does_not_match_empty_segment(routes):
+    routes(("get_item", "/items/{id}"), ("get_sub", "/items/{id}/sub"))
+
+    assert get_function_name_and_path_parameters(logger, "/items/") == (None, None)
+    assert get_function_name_and_path_parameters(logger, "/items//sub") == (
+        None,
+        None,
+    )
+
+
+def test_mixed_segment(routes):
+    routes(("get_file", "/files/{name}.json"))
+
+    assert get_function_name_and_path_parameters(logger, "/files/a.json") == (
+        "get_file",
+        {"name": "a"},
+    )
+    assert get_function_name_and_path_parameters(logger, "/files/abcXjson") == (
+        None,
+        None,
+    )
+    assert get_function_name_and_path_parameters(logger, "/files/a/b.json") == (
+        None,
+        None,
+    )
+
+
+def test_mixed_segment_honours_config_order(routes):
+    routes(("get_file", "/files/{name}.json"), ("get_any", "/files/{path}"))
+
+    assert get_function_name_and_path_parameters(logger, "/files/a.json") == (
+        "get_file",
+        {"name": "a"},
+    )
+    assert get_function_name_and_path_parameters(logger, "/files/a.txt") == (
+        "get_any",
+        {"path": "a.txt"},
+    )
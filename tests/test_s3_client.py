@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+__author__ = "bibow"
+
+import io
+import logging
+import os
+import zipfile
+
+import pytest
+
+from openai_action_engine.handlers import s3_client
+from openai_action_engine.handlers.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def _zip_bytes(files):
+    """
+    Build an in-memory ZIP holding the given {name: content} files, in order.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_ref:
+        for name, content in files.items():
+            zip_ref.writestr(name, content)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def extract_path(tmp_path, monkeypatch):
+    path = tmp_path / "functs"
+    monkeypatch.setattr(Config, "funct_extract_path", str(path))
+    return path
+
+
+def test_extract_with_shared_first_entry(extract_path):
+    (extract_path / "vendorlib").mkdir(parents=True)
+    (extract_path / "vendorlib" / "__init__.py").write_text("")
+    data = _zip_bytes(
+        {
+            "vendorlib/__init__.py": "",
+            "mymod/__init__.py": "VALUE = 1\n",
+        }
+    )
+
+    s3_client.extract_module_from_bytes(logger, "mymod", data)
+
+    assert (extract_path / "mymod" / "__init__.py").read_text() == "VALUE = 1\n"
+
+
+def test_extract_skips_existing_files(extract_path):
+    (extract_path / "mymod").mkdir(parents=True)
+    (extract_path / "mymod" / "__init__.py").write_text("LOCAL = 1\n")
+    data = _zip_bytes(
+        {
+            "mymod/__init__.py": "VALUE = 1\n",
+            "mymod/helpers.py": "HELPER = 1\n",
+        }
+    )
+
+    s3_client.extract_module_from_bytes(logger, "mymod", data)
+
+    assert (extract_path / "mymod" / "__init__.py").read_text() == "LOCAL = 1\n"
+    assert (extract_path / "mymod" / "helpers.py").read_text() == "HELPER = 1\n"
+
+
+def test_extract_rejects_unsafe_path(extract_path, tmp_path):
+    data = _zip_bytes({"../escaped.py": "VALUE = 1\n"})
+
+    with pytest.raises(Exception, match="Unsafe path"):
+        s3_client.extract_module_from_bytes(logger, "mymod", data)
+
+    assert not (tmp_path / "escaped.py").exists()
+
+
+def test_download_module_skips_matching_etag(fake_s3):
+    fake_s3.put("mymod.zip", _zip_bytes({"mymod/__init__.py": ""}))
+
+    zip_path = s3_client.download_module(logger, "mymod")
+    fake_s3.calls.clear()
+    assert s3_client.download_module(logger, "mymod") == zip_path
+
+    assert fake_s3.calls == [("head_object", "mymod.zip")]
+    with open(f"{zip_path}.etag") as f:
+        assert f.read() == fake_s3.head_object("functs", "mymod.zip")["ETag"]
+
+
+def test_download_module_rewrites_changed_etag(fake_s3):
+    fake_s3.put("mymod.zip", _zip_bytes({"mymod/__init__.py": ""}))
+    zip_path = s3_client.download_module(logger, "mymod")
+
+    data = _zip_bytes({"mymod/__init__.py": "VALUE = 2\n"})
+    fake_s3.put("mymod.zip", data)
+    fake_s3.calls.clear()
+    s3_client.download_module(logger, "mymod")
+
+    assert ("download_file", "mymod.zip") in fake_s3.calls
+    with open(zip_path, "rb") as f:
+        assert f.read() == data
+    with open(f"{zip_path}.etag") as f:
+        assert f.read() == fake_s3.head_object("functs", "mymod.zip")["ETag"]
+
+
+def test_download_and_extract_from_memory(fake_s3):
+    fake_s3.put("mymod.zip", _zip_bytes({"mymod/__init__.py": "VALUE = 1\n"}))
+
+    s3_client.download_and_extract_module(logger, "mymod")
+
+    assert fake_s3.calls == [("get_object", "mymod.zip")]
+    assert not os.path.exists(os.path.join(Config.funct_zip_path, "mymod.zip"))
+    assert os.path.isfile(os.path.join(Config.funct_extract_path, "mymod/__init__.py"))
+    assert s3_client.module_exists(logger, "mymod")
+
+
+def test_download_and_extract_falls_back_to_file(fake_s3, monkeypatch):
+    data = _zip_bytes({"mymod/__init__.py": "VALUE = 1\n"})
+    fake_s3.put("mymod.zip", data)
+    monkeypatch.setattr(s3_client, "_IN_MEMORY_ZIP_LIMIT", len(data) - 1)
+
+    s3_client.download_and_extract_module(logger, "mymod")
+
+    assert ("download_file", "mymod.zip") in fake_s3.calls
+    assert os.path.exists(os.path.join(Config.funct_zip_path, "mymod.zip"))
+    assert os.path.isfile(os.path.join(Config.funct_extract_path, "mymod/__init__.py"))
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+__author__ = "bibow"
+
+import logging
+
+from openai_action_engine.handlers.config import Config
+from openai_action_engine.handlers.swagger_generator import (
+    _handle_properties,
+    generate_swagger_json,
+    generate_swagger_yaml,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def test_documents_cached_for_same_revision(setting):
+    Config.initialize(logger, **setting)
+    swagger_yaml = generate_swagger_yaml(logger)
+    swagger_json = generate_swagger_json(logger)
+
+    Config.initialize(logger, **setting)
+
+    assert generate_swagger_yaml(logger) is swagger_yaml
+    assert generate_swagger_json(logger) is swagger_json
+
+
+def test_documents_regenerated_on_revision_change(setting):
+    Config.initialize(logger, **setting)
+    generate_swagger_yaml(logger)
+    generate_swagger_json(logger)
+
+    Config.initialize(logger, **dict(setting, title="Renamed Actions"))
+
+    assert "Renamed Actions" in generate_swagger_yaml(logger)
+    assert "Renamed Actions" in generate_swagger_json(logger)
+
+
+def test_documents_kept_on_configuration_change(setting):
+    Config.initialize(logger, **setting)
+    swagger_yaml = generate_swagger_yaml(logger)
+
+    Config.initialize(logger, **dict(setting, configuration={"tenant": "B"}))
+
+    assert generate_swagger_yaml(logger) is swagger_yaml
+
+
+def test_equal_properties_lists_share_one_schema():
+    cache = {}
+    first = _handle_properties([{"name": "id", "type": "string"}], cache)
+    second = _handle_properties([{"name": "id", "type": "string"}], cache)
+
+    assert first is second
+
+
+def test_nested_properties():
+    properties = [
+        {
+            "name": "items",
+            "type": "list",
+            "child_type": "dict",
+            "properties": [{"name": "id", "type": "integer"}],
+        },
+        {
+            "name": "owner",
+            "type": "dict",
+            "properties": [{"name": "name", "type": "string"}],
+        },
+    ]
+
+    assert _handle_properties(properties) == {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"id": {"type": "integer"}},
+            },
+        },
+        "owner": {"type": "object", "properties": {"name": {"type": "string"}}},
+    }